@@ -27,10 +27,12 @@ from my_fastapi_nacos.http.http_client import (
   GetMapping,
   PostMapping,
   PutMapping,
-  DeleteMapping
+  DeleteMapping,
+  close_feign_clients
 )
 
 from my_fastapi_nacos.core.value import Value
+from my_fastapi_nacos.utils.log_utils import configure_logging
 
 __version__ = "0.1.0"
 __all__ = [
@@ -71,7 +73,11 @@ __all__ = [
     "PostMapping",
     "PutMapping",
     "DeleteMapping",
+    "close_feign_clients",
     
     # 配置值装饰器
-    "Value"
+    "Value",
+    
+    # 日志配置
+    "configure_logging"
 ]
\ No newline at end of file
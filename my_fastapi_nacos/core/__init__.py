@@ -1,13 +1,16 @@
+import asyncio
 from my_fastapi_nacos.core.manager import NacosClientManager
 from my_fastapi_nacos.core.dependencies import init_nacos_registry_discovery_client, init_nacos_config_client
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from my_fastapi_nacos.models.config import ConfigListener
-from my_fastapi_nacos.utils.log_utils import log
+from my_fastapi_nacos.utils.log_utils import log, configure_logging
 from my_fastapi_nacos.config import app_config
 from my_fastapi_nacos.utils.ip_utils import get_ip_address
+from my_fastapi_nacos.http.http_client import close_feign_clients
 
-global_ip = get_ip_address()
+# 本机IP，应用启动时获取
+global_ip = None
 
 async def init_nacos_registry_client():
   """初始化Nacos注册中心客户端"""
@@ -73,14 +76,28 @@ async def init_watch_config():
 
 async def startup():
   """自定义启动逻辑"""
+  global global_ip
+  configure_logging()
+  if global_ip is None:
+    global_ip = get_ip_address()
   try:
-    # 初始化Nacos注册中心客户端
-    await init_nacos_registry_client()
-    # 初始化Nacos配置中心客户端
-    await init_config_client()
-    # 注册服务
+    # 并发初始化Nacos注册中心客户端和配置中心客户端，一方失败不影响另一方
+    registry_result, config_result = await asyncio.gather(
+      init_nacos_registry_client(),
+      init_config_client(),
+      return_exceptions=True
+    )
+    if isinstance(config_result, Exception):
+      log.error(f"Nacos配置中心客户端初始化失败: {config_result}")
+    if isinstance(registry_result, Exception):
+      raise registry_result
+    # 注册服务，未配置应用名或注册中心时不发起注册请求
     app_name = app_config.get("app.name")
-    if app_name:
+    if not app_name:
+      log.info("app.name未配置，跳过服务注册")
+    elif NacosClientManager.get_instance().registry is None:
+      log.info("Nacos注册中心客户端未初始化，跳过服务注册")
+    else:
       await NacosClientManager.get_instance().register_service(
         service_name=app_name,
         ip=global_ip,
@@ -90,23 +107,29 @@ async def startup():
     log.error(f"服务注册失败: {e}")
     log.info("注意：这可能是因为Nacos服务器未启动或无法连接。测试应用其他功能仍可正常进行。")
 
+async def deregister():
+  """注销服务"""
+  app_name = app_config.get("app.name")
+  if app_name and NacosClientManager.get_instance().registry is not None:
+    await NacosClientManager.get_instance().deregister_service(
+      service_name=app_name,
+      ip=global_ip,
+      port=app_config.get("app.port", 8000),
+    )
+
 async def shutdown():
   """自定义关闭逻辑"""
-  try:
-    # 注销服务
-    app_name = app_config.get("app.name")
-    if app_name:
-      await NacosClientManager.get_instance().deregister_service(
-        service_name=app_name,
-        ip=global_ip,
-        port=app_config.get("app.port", 8000),
-      )
-
-    # 关闭Nacos客户端管理器
-    await NacosClientManager.get_instance().config_shutdown()
-  except Exception as e:
-    log.error(f"服务注销失败: {e}")
-    log.info("注意：这可能是因为Nacos服务器未启动或无法连接。测试应用其他功能仍可正常进行。")
+  # 并发注销服务、关闭Nacos配置中心客户端和Feign客户端连接池
+  results = await asyncio.gather(
+    deregister(),
+    NacosClientManager.get_instance().config_shutdown(),
+    close_feign_clients(),
+    return_exceptions=True
+  )
+  for result in results:
+    if isinstance(result, Exception):
+      log.error(f"服务注销失败: {result}")
+      log.info("注意：这可能是因为Nacos服务器未启动或无法连接。测试应用其他功能仍可正常进行。")
 
 @asynccontextmanager
 async def nacos_lifespan(app: FastAPI):
@@ -118,33 +141,31 @@ async def nacos_lifespan(app: FastAPI):
     # 启动逻辑
     await startup()
     
-    # 应用运行期间
-    yield
-    
-    # 关闭逻辑
-    await shutdown()
-    
-    log.info("应用关闭")
+    try:
+      # 应用运行期间
+      yield
+    finally:
+      # 关闭逻辑
+      await shutdown()
+      
+      log.info("应用关闭")
 
 def init_nacos_with_fastapi(app: FastAPI):
   """
   初始化Nacos客户端并注册FastAPI服务
   """
+  configure_logging()
   if app.router.lifespan_context:
       log.warning("FastAPI应用已配置自定义生命周期管理")
       original_lifespan = app.router.lifespan_context
       
-      # 包装生命周期管理
+      # 包装生命周期管理，原有生命周期运行在nacos生命周期之内
       @asynccontextmanager
       async def wrapped_lifespan(app: FastAPI):
-        # 执行自定义的nacos生命周期管理
-        await startup()
-        # 执行原有生命周期管理
-        async with original_lifespan(app) as state:
-            yield state
-        
-        # 执行自定义的关闭逻辑
-        await shutdown()
+        async with nacos_lifespan(app):
+          # 执行原有生命周期管理
+          async with original_lifespan(app) as state:
+              yield state
       
       app.router.lifespan_context = wrapped_lifespan
       log.info("Nacos生命周期管理已集成到FastAPI应用")
@@ -1,10 +1,24 @@
-import json
+import asyncio
+import functools
+import inspect
+import orjson
 import yaml
-from typing import Dict, Optional
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
 from v2.nacos import NacosConfigService
+from v2.nacos.config.model.config_param import ConfigParam
 from my_fastapi_nacos.models.config import ConfigListener
 from my_fastapi_nacos.utils.exceptions import ConfigError, ConfigListenerError
 
+try:
+    # 优先使用LibYAML实现的C加速解析器
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+# 配置缓存键: (namespace, group, data_id)
+ConfigKey = Tuple[str, str, str]
+
 
 class ConfigManager:
     """配置中心管理类"""
@@ -27,42 +41,123 @@ class ConfigManager:
         self.namespace = namespace
         self.username = username
         self.password = password
-        self.config_listeners: Dict[str, ConfigListener] = {}  # 配置监听器
+        # 以下缓存均以(namespace, group, data_id)元组为键
+        self.config_listeners: Dict[ConfigKey, List[ConfigListener]] = {}  # 配置监听器，同一配置可以有多个回调
+        self.config_cache: OrderedDict[ConfigKey, str] = OrderedDict()  # 配置缓存，只缓存已添加监听器的配置，由监听回调保持最新
+        self.parsed_cache: OrderedDict[ConfigKey, Tuple[str, Dict]] = OrderedDict()  # 解析结果缓存，格式: {cache_key: (配置内容, 解析结果)}
+        self.cache_max = 1024  # 缓存最大条目数，超出时淘汰最久未使用的条目
+        self._inflight: Dict[ConfigKey, asyncio.Task] = {}  # 进行中的配置获取请求
+        self._sdk_listeners: Dict[ConfigKey, Callable] = {}  # 注册到Nacos SDK的监听回调，每个配置只订阅一次
+        self._subscribing: Dict[ConfigKey, asyncio.Future] = {}  # 进行中的Nacos订阅，完成后移除
+    
+    def _cache_key(self, data_id: str, group: str) -> ConfigKey:
+        """
+        构建当前命名空间下的配置缓存键
+        
+        Args:
+            data_id: 配置数据ID
+            group: 配置分组
+            
+        Returns:
+            ConfigKey: 配置缓存键
+        """
+        return (self.namespace, group, data_id)
     
     async def get_config(self, data_id: str, group: str = "DEFAULT_GROUP") -> Optional[str]:
         """
         获取配置信息
         
+        相同配置的并发请求共享同一次Nacos请求
+        
         Args:
             data_id: 配置数据ID
             group: 配置分组，默认DEFAULT_GROUP
             
+        Returns:
+            Optional[str]: 配置内容
+        """
+        cache_key = self._cache_key(data_id, group)
+        if cache_key in self.config_cache:
+            self.config_cache.move_to_end(cache_key)
+            return self.config_cache[cache_key]
+        
+        # 检查与登记之间没有await，事件循环内无需加锁
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_config(data_id, group))
+            self._inflight[cache_key] = task
+            task.add_done_callback(functools.partial(self._inflight_done, cache_key))
+        # 所有调用方都通过shield等待，任一调用方被取消不会影响其他调用方
+        content = await asyncio.shield(task)
+        
+        # 已添加监听器的配置由监听回调保持最新，可以缓存；监听回调已写入的更新内容优先
+        if cache_key in self.config_listeners and cache_key not in self.config_cache:
+            self._cache_put(self.config_cache, cache_key, content)
+        return content
+    
+    def _inflight_done(self, cache_key: ConfigKey, task: asyncio.Task) -> None:
+        """
+        配置获取请求完成后移除登记
+        
+        Args:
+            cache_key: 配置缓存键
+            task: 已完成的配置获取任务
+        """
+        if self._inflight.get(cache_key) is task:
+            del self._inflight[cache_key]
+        # 标记异常已被获取，避免所有调用方都已取消时输出告警
+        if not task.cancelled():
+            task.exception()
+    
+    def _cache_put(self, cache: OrderedDict, key: ConfigKey, value) -> None:
+        """
+        写入LRU缓存，超出上限时淘汰最久未使用的条目
+        
+        Args:
+            cache: 缓存字典
+            key: 缓存键
+            value: 缓存值
+        """
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > self.cache_max:
+            cache.popitem(last=False)
+    
+    async def _fetch_config(self, data_id: str, group: str) -> Optional[str]:
+        """
+        从Nacos获取配置信息
+        
+        Args:
+            data_id: 配置数据ID
+            group: 配置分组
+            
         Returns:
             Optional[str]: 配置内容
         """
         try:
-            self.logger.info(f"获取配置: data_id={data_id}, group={group}")
+            self.logger.info("获取配置: data_id={}, group={}", data_id, group)
             
             # 调用Nacos客户端获取配置
-            from v2.nacos.config.model.config_param import ConfigParam
             config_param = ConfigParam(
                 data_id=data_id,
                 group=group
             )
             content = await self.config_service.get_config(config_param)
             
-            self.logger.debug(f"配置获取结果: {content}")
+            self.logger.debug("配置获取结果: {}", content)
             
-            self.logger.info(f"配置获取成功: data_id={data_id}")
+            self.logger.info("配置获取成功: data_id={}", data_id)
             return content
         except Exception as e:
-            self.logger.error(f"获取配置失败: data_id={data_id}，错误: {str(e)}")
+            self.logger.error("获取配置失败: data_id={}，错误: {}", data_id, e)
             raise ConfigError(f"获取配置失败: {str(e)}") from e
     
     async def get_config_dict(self, data_id: str, group: str = "DEFAULT_GROUP") -> Dict:
         """
         获取配置信息并转换为字典
         
+        配置内容未变化时直接返回缓存的解析结果，返回的字典请勿修改
+        
         Args:
             data_id: 配置数据ID
             group: 配置分组，默认DEFAULT_GROUP
@@ -74,21 +169,36 @@ class ConfigManager:
         if not content:
             return {}
         
-        try:
-            # 尝试解析为JSON
-            return json.loads(content)
-        except json.JSONDecodeError:
+        cache_key = self._cache_key(data_id, group)
+        cached = self.parsed_cache.get(cache_key)
+        if cached is not None and cached[0] == content:
+            self.parsed_cache.move_to_end(cache_key)
+            return cached[1]
+        
+        parsed = None
+        # 只有疑似JSON的内容才尝试按JSON解析
+        if content.lstrip()[:1] in ("{", "["):
+            try:
+                parsed = orjson.loads(content)
+            except orjson.JSONDecodeError:
+                pass
+        if parsed is None:
             try:
                 # 尝试解析为YAML
-                return yaml.safe_load(content)
+                parsed = yaml.load(content, Loader=_SafeLoader)
             except yaml.YAMLError:
-                self.logger.error(f"配置内容解析失败: data_id={request.data_id}")
-                raise ConfigError(f"配置内容解析失败: data_id={request.data_id}")
+                self.logger.error("配置内容解析失败: data_id={}", data_id)
+                raise ConfigError(f"配置内容解析失败: data_id={data_id}")
+        
+        self._cache_put(self.parsed_cache, cache_key, (content, parsed))
+        return parsed
     
     async def add_listener(self, listener: ConfigListener) -> bool:
         """
         添加配置监听器
         
+        同一配置的多个回调共享一次Nacos订阅，相同回调重复添加时直接返回
+        
         Args:
             listener: 配置监听器模型
             
@@ -96,86 +206,112 @@ class ConfigManager:
             bool: 添加是否成功
         """
         try:
-            listener_key = f"{self.namespace}:{listener.group}:{listener.data_id}"
-            self.logger.info(f"添加配置监听器: {listener_key}")
+            listener_key = self._cache_key(listener.data_id, listener.group)
+            self.logger.info("添加配置监听器: {}", listener_key)
             
-            # 保存监听器
-            self.config_listeners[listener_key] = listener
+            # 同一配置的订阅进行中时等待其完成，避免并发添加时重复订阅；订阅失败时由当前调用重新订阅
+            while (pending := self._subscribing.get(listener_key)) is not None:
+                await asyncio.wait({pending})
             
-            # 在新版本的Nacos SDK中，使用add_listener方法添加监听器
-            # 该方法内部会管理监听线程
-            await self.config_service.add_listener(
-                data_id=listener.data_id,
-                group=listener.group,
-                listener=listener.callback
-            )
-            self.logger.info(f"配置监听器添加成功: {listener_key}")
+            listeners = self.config_listeners.get(listener_key)
+            if listeners is not None:
+                # 相同回调已在监听，避免重复通知
+                if any(existing.callback == listener.callback for existing in listeners):
+                    self.logger.info("配置监听器已存在，跳过添加: {}", listener_key)
+                    return True
+                # 配置已在Nacos中订阅，只需登记新的回调
+                listeners.append(listener)
+                self.logger.info("配置监听器添加成功: {}", listener_key)
+                return True
+            
+            async def on_config_change(tenant, group, data_id, content):
+                # Nacos SDK按(tenant, group, data_id, content)的顺序调用监听回调
+                # 配置变更时先更新缓存，再依次通知该配置的所有监听器
+                self._cache_put(self.config_cache, listener_key, content)
+                self.parsed_cache.pop(listener_key, None)
+                for config_listener in tuple(self.config_listeners.get(listener_key, ())):
+                    try:
+                        result = config_listener.callback(tenant, group, data_id, content)
+                        if inspect.isawaitable(result):
+                            await result
+                    except Exception as e:
+                        # 单个监听器失败不影响其他监听器
+                        self.logger.error("配置监听器执行失败: {}，错误: {}", listener_key, e)
+            
+            # 在await之前登记进行中的订阅
+            subscribing = asyncio.get_running_loop().create_future()
+            self._subscribing[listener_key] = subscribing
+            try:
+                # 在新版本的Nacos SDK中，使用add_listener方法添加监听器
+                # 该方法内部会管理监听线程
+                await self.config_service.add_listener(
+                    data_id=listener.data_id,
+                    group=listener.group,
+                    listener=on_config_change
+                )
+                
+                # 订阅成功后保存监听器
+                self.config_listeners[listener_key] = [listener]
+                self._sdk_listeners[listener_key] = on_config_change
+            finally:
+                # 无论订阅是否成功都唤醒等待的调用方
+                del self._subscribing[listener_key]
+                subscribing.set_result(None)
+            self.logger.info("配置监听器添加成功: {}", listener_key)
             return True
         except Exception as e:
-            self.logger.error(f"添加配置监听器失败: {listener_key}，错误: {str(e)}")
+            self.logger.error("添加配置监听器失败: {}，错误: {}", listener_key, e)
             raise ConfigListenerError(f"添加配置监听器失败: {str(e)}") from e
     
-    async def remove_listener(self, data_id: str, group: str = "DEFAULT_GROUP", namespace: str = "") -> bool:
+    async def remove_listener(self, data_id: str, group: str = "DEFAULT_GROUP", namespace: str = "", callback: Optional[Callable] = None) -> bool:
         """
         移除配置监听器
         
         Args:
             data_id: 配置ID
             group: 配置分组
-            namespace: 命名空间ID
+            namespace: 命名空间ID，默认使用当前管理器的命名空间
+            callback: 要移除的回调函数，默认移除该配置的所有监听器
             
         Returns:
             bool: 移除是否成功
         """
         try:
-            listener_key = f"{namespace}:{group}:{data_id}"
-            self.logger.info(f"移除配置监听器: {listener_key}")
+            listener_key = (namespace or self.namespace, group, data_id)
+            self.logger.info("移除配置监听器: {}", listener_key)
             
-            # 获取监听器
-            if listener_key in self.config_listeners:
-                listener = self.config_listeners[listener_key]
-                
+            listeners = self.config_listeners.get(listener_key)
+            remaining = []
+            if listeners and callback is not None:
+                remaining = [listener for listener in listeners if listener.callback != callback]
+                if len(remaining) == len(listeners):
+                    # 指定的回调未在监听该配置
+                    listeners = None
+            if not listeners:
+                self.logger.warning("配置监听器不存在: {}", listener_key)
+                return False
+            
+            if remaining:
+                # 仍有其他监听器时保留Nacos订阅
+                self.config_listeners[listener_key] = remaining
+            else:
                 # 在新版本的Nacos SDK中，使用remove_listener方法移除监听器
                 await self.config_service.remove_listener(
-                    data_id=listener.data_id,
-                    group=listener.group,
-                    listener=listener.callback
+                    data_id=data_id,
+                    group=group,
+                    listener=self._sdk_listeners[listener_key]
                 )
                 
-                # 移除监听器
+                # 移除监听器，不再监听的配置不能继续缓存
                 del self.config_listeners[listener_key]
-                self.logger.info(f"配置监听器移除成功: {listener_key}")
-                return True
-            else:
-                self.logger.warning(f"配置监听器不存在: {listener_key}")
-                return False
+                del self._sdk_listeners[listener_key]
+                self.config_cache.pop(listener_key, None)
+            self.logger.info("配置监听器移除成功: {}", listener_key)
+            return True
         except Exception as e:
-            self.logger.error(f"移除配置监听器失败: {listener_key}，错误: {str(e)}")
+            self.logger.error("移除配置监听器失败: {}，错误: {}", listener_key, e)
             raise ConfigListenerError(f"移除配置监听器失败: {str(e)}") from e
     
-    def _start_listener(self, listener: ConfigListener, listener_key: str):
-        """
-        启动配置监听线程
-        
-        注意：在新版本的Nacos SDK中，监听器由SDK内部管理，不需要手动启动监听线程
-        
-        Args:
-            listener: 配置监听器模型
-            listener_key: 监听器键
-        """
-        self.logger.info(f"配置监听器 {listener_key} 由Nacos SDK内部管理")
-    
-    def _stop_listener(self, listener_key: str):
-        """
-        停止配置监听线程
-        
-        注意：在新版本的Nacos SDK中，监听器由SDK内部管理，不需要手动停止监听线程
-        
-        Args:
-            listener_key: 监听器键
-        """
-        self.logger.info(f"配置监听器 {listener_key} 由Nacos SDK内部管理")
-
     async def shutdown(self):
         """
         关闭配置中心客户端
@@ -2,8 +2,11 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status
 from my_fastapi_nacos.core import NacosClientManager
 
-# 全局Nacos客户端实例
-_nacos_client_manager: Optional[NacosClientManager] = None
+# Nacos客户端未初始化异常，预先构建以复用
+_NOT_INIT_ERR = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Nacos客户端未初始化，请先调用init_nacos_registry_discovery_client或init_nacos_config_client函数"
+)
 
 
 async def init_nacos_registry_discovery_client(
@@ -21,9 +24,8 @@ async def init_nacos_registry_discovery_client(
         username: Nacos用户名
         password: Nacos密码
     """
-    global _nacos_client_manager
-    _nacos_client_manager = NacosClientManager.get_instance()
-    await _nacos_client_manager.init_registry_discovery_service(
+    # 注册中心与配置中心共用同一个Nacos客户端管理器单例
+    await NacosClientManager.get_instance().init_registry_discovery_service(
         server_addresses, namespace, username, password
     )
 
@@ -42,9 +44,8 @@ async def init_nacos_config_client(
         username: Nacos用户名
         password: Nacos密码
     """
-    global _nacos_client_manager
-    _nacos_client_manager = NacosClientManager.get_instance()
-    await _nacos_client_manager.init_config_service(
+    # 注册中心与配置中心共用同一个Nacos客户端管理器单例
+    await NacosClientManager.get_instance().init_config_service(
         server_addresses, namespace, username, password
     )
 
@@ -56,14 +57,13 @@ def get_nacos_client() -> NacosClientManager:
         NacosClientManager: Nacos客户端实例
         
     Raises:
-        HTTPException: 如果Nacos客户端未初始化
+        HTTPException: 如果注册中心和配置中心客户端均未初始化（503）
     """
     client = NacosClientManager.get_instance()
-    if client is None:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Nacos客户端未初始化，请先调用init_nacos_registry_discovery_client或init_nacos_config_client函数"
-        )
+    # get_instance总会返回单例，需检查是否已初始化任一客户端
+    if client.registry is None and client.config is None:
+        # 清除上次抛出时附带的调用栈，避免共享的异常实例不断累积traceback
+        raise _NOT_INIT_ERR.with_traceback(None)
     return client
 
 def get_nacos_client_no_exception() -> NacosClientManager:
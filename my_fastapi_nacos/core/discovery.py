@@ -1,6 +1,6 @@
 import random
 import time
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from v2.nacos import NacosNamingService
 from my_fastapi_nacos.models.service import ServiceInstance, ServiceInfo
 from my_fastapi_nacos.utils.exceptions import ServiceDiscoveryError
@@ -33,8 +33,8 @@ class ServiceDiscovery:
         self.namespace = namespace
         self.username = username
         self.password = password
-        self.service_cache: Dict[str, Dict] = {}  # 服务缓存，格式: {"service_group": {"instances": [], "timestamp": 0}}
-        self.cache_ttl = 30  # 缓存有效期，单位：秒
+        self.service_cache: Dict[Tuple, Dict] = {}  # 服务缓存，格式: {(service_name, group_name, healthy_only, clusters): {"instances": [], "timestamp": 0}}
+        self.cache_ttl = 2  # 缓存有效期，单位：秒
     
     async def get_service_instances(
         self,
@@ -44,7 +44,37 @@ class ServiceDiscovery:
         clusters: Optional[List[str]] = None
     ) -> List[ServiceInstance]:
         """
-        获取服务实例列表
+        获取服务实例列表，缓存有效期内直接返回缓存结果
+        
+        Args:
+            service_name: 服务名称
+            group_name: 服务分组
+            healthy_only: 是否只返回健康实例
+            clusters: 集群列表
+            
+        Returns:
+            List[ServiceInstance]: 服务实例列表
+        """
+        cache_key = (service_name, group_name, healthy_only, tuple(clusters or ()))
+        if self._is_cache_valid(cache_key):
+            return list(self.service_cache[cache_key]["instances"])
+        
+        service_instances = await self._fetch_service_instances(service_name, group_name, healthy_only, clusters)
+        self.service_cache[cache_key] = {
+            "instances": service_instances,
+            "timestamp": self._get_current_timestamp()
+        }
+        return list(service_instances)
+    
+    async def _fetch_service_instances(
+        self,
+        service_name: str,
+        group_name: str,
+        healthy_only: bool,
+        clusters: Optional[List[str]]
+    ) -> List[ServiceInstance]:
+        """
+        从Nacos查询服务实例列表
         
         Args:
             service_name: 服务名称
@@ -358,36 +388,40 @@ class ServiceDiscovery:
         try:
             self.logger.info(f"刷新服务缓存: {service_name}，分组: {group_name}")
             
-            # 获取最新的服务实例
-            instances = await self.get_service_instances(
+            # 清除旧缓存后重新获取最新的服务实例，结果会写入缓存
+            self.invalidate_service_cache(service_name, group_name)
+            await self.get_service_instances(
                 service_name=service_name,
                 group_name=group_name,
                 healthy_only=False
             )
             
-            # 更新缓存
-            cache_key = f"{service_name}@{group_name}"
-            self.service_cache[cache_key] = {
-                "instances": instances,
-                "timestamp": self._get_current_timestamp()
-            }
-            
             self.logger.info(f"服务缓存刷新成功: {service_name}")
         except Exception as e:
             self.logger.error(f"刷新服务缓存失败: {service_name}，错误: {str(e)}")
             raise ServiceDiscoveryError(f"刷新服务缓存失败: {str(e)}") from e
     
-    def _get_current_timestamp(self) -> int:
+    def invalidate_service_cache(self, service_name: str, group_name: str = "DEFAULT_GROUP"):
+        """
+        清除指定服务的所有缓存
+        
+        Args:
+            service_name: 服务名称
+            group_name: 服务分组
+        """
+        for cache_key in [key for key in self.service_cache if key[0] == service_name and key[1] == group_name]:
+            del self.service_cache[cache_key]
+    
+    def _get_current_timestamp(self) -> float:
         """
-        获取当前时间戳
+        获取当前时间戳（单调时钟，不受系统时间调整影响）
         
         Returns:
-            int: 当前时间戳（秒）
+            float: 当前时间戳（秒）
         """
-        import time
-        return int(time.time())
+        return time.monotonic()
     
-    def _is_cache_valid(self, cache_key: str) -> bool:
+    def _is_cache_valid(self, cache_key: Tuple) -> bool:
         """
         检查缓存是否有效
         
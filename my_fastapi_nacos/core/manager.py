@@ -1,5 +1,7 @@
+import asyncio
+import functools
 from typing import Dict, Optional, List, Callable, Any
-from v2.nacos import ClientConfigBuilder, NacosNamingService, NacosConfigService
+from v2.nacos import ClientConfig, ClientConfigBuilder, NacosNamingService, NacosConfigService
 from my_fastapi_nacos.core.registration import ServiceRegistry
 from my_fastapi_nacos.core.discovery import ServiceDiscovery
 from my_fastapi_nacos.core.config import ConfigManager
@@ -8,22 +10,61 @@ from my_fastapi_nacos.models.config import ConfigListener
 from my_fastapi_nacos.utils.log_utils import log, log_dir, log_level
 from my_fastapi_nacos.utils.exceptions import NacosConnectionError
 from my_fastapi_nacos.utils.app_config_utils import parse_yaml_content, AppConfig
+import threading
 import yaml
 
+
+@functools.lru_cache(maxsize=8)
+def _build_client_config(
+    server_addresses: str,
+    namespace: str = "",
+    username: Optional[str] = None,
+    password: Optional[str] = None,
+) -> ClientConfig:
+    """
+    构建Nacos客户端配置，相同连接参数复用同一个配置对象
+    
+    Args:
+        server_addresses: Nacos服务器地址
+        namespace: Nacos命名空间ID
+        username: Nacos用户名
+        password: Nacos密码
+        
+    Returns:
+        ClientConfig: Nacos客户端配置
+    """
+    return (ClientConfigBuilder()
+              .server_address(server_addresses)
+              .namespace_id(namespace)
+              .username(username)
+              .password(password)
+              .log_level(log_level)
+              .log_dir(log_dir)
+              .build()
+            )
+
+
 class NacosClientManager:
     """Nacos客户端管理器，SDK的主要入口点"""
     
     # 单例实例
     _instance: Optional['NacosClientManager'] = None
+    # 单例创建锁，同步与异步调用方共用
+    _instance_lock = threading.Lock()
     
     def __init__(self):
         """
         初始化Nacos客户端管理器
+        
+        请通过get_instance获取单例实例
         """
-        NacosClientManager._instance = self
         print("初始化Nacos客户端管理器-----------------------------------")
         # 维护全局配置字典，用于存储解析后的Nacos配置信息
         self.all_config_dict: Dict[str, AppConfig] = {}
+        # 注册中心与配置中心服务，初始化后赋值
+        self._registry: Optional[ServiceRegistry] = None
+        self._discovery: Optional[ServiceDiscovery] = None
+        self._config: Optional[ConfigManager] = None
 
     async def init_registry_discovery_service(
         self,
@@ -42,15 +83,7 @@ class NacosClientManager:
             password: Nacos密码
         """
         try:
-            client_config = (ClientConfigBuilder()
-                              .server_address(server_addresses)
-                              .namespace_id(namespace)
-                              .username(username)
-                              .password(password)
-                              .log_level(log_level)
-                              .log_dir(log_dir)
-                              .build()
-                            )
+            client_config = _build_client_config(server_addresses, namespace, username, password)
             self.naming_service = await NacosNamingService.create_naming_service(client_config)
             self._registry = ServiceRegistry(self.naming_service, log, server_addresses, namespace, username, password)
             self._discovery = ServiceDiscovery(self.naming_service, log, server_addresses, namespace, username, password)
@@ -86,15 +119,7 @@ class NacosClientManager:
         """
         # 初始化配置中心基础服务
         try:
-            client_config = (ClientConfigBuilder()
-                              .server_address(server_addresses)
-                              .namespace_id(namespace)
-                              .username(username)
-                              .password(password)
-                              .log_level(log_level)
-                              .log_dir(log_dir)
-                              .build()
-                            )
+            client_config = _build_client_config(server_addresses, namespace, username, password)
             self.config_service = await NacosConfigService.create_config_service(client_config)
             self._config = ConfigManager(self.config_service, log, server_addresses, namespace, username, password)
         except Exception as e:
@@ -122,7 +147,7 @@ class NacosClientManager:
             yaml.YAMLError: YAML解析错误
             Exception: 其他未知错误
         """
-        if not hasattr(self, '_config'):
+        if self._config is None:
             raise NacosConnectionError("配置中心服务未初始化，请先调用init_config_service方法")
         
         try:
@@ -218,6 +243,7 @@ class NacosClientManager:
               cluster_name=cluster_name,
               ephemeral=ephemeral
           )
+          self._invalidate_service_cache(service_name, group_name)
           return instance_id
         else:
           log.error("Nacos注册中心客户端未初始化")
@@ -246,7 +272,7 @@ class NacosClientManager:
             bool: 注销是否成功
         """
         if self.registry:
-          return await self.registry.deregister_service(
+          result = await self.registry.deregister_service(
               service_name=service_name,
               group_name=group_name,
               ip=ip,
@@ -254,10 +280,17 @@ class NacosClientManager:
               cluster_name=cluster_name,
               ephemeral=ephemeral
           )
+          self._invalidate_service_cache(service_name, group_name)
+          return result
         else:
           log.error("Nacos注册中心客户端未初始化")
           return False
     
+    def _invalidate_service_cache(self, service_name: str, group_name: str) -> None:
+        """服务实例变化后清除服务发现缓存"""
+        if self.discovery:
+          self.discovery.invalidate_service_cache(service_name, group_name)
+    
     async def get_service_instances(
         self,
         service_name: str,
@@ -284,6 +317,37 @@ class NacosClientManager:
             clusters=clusters
         )
     
+    async def get_many_service_instances(
+        self,
+        service_names: List[str],
+        group_name: str = "DEFAULT_GROUP",
+        healthy_only: bool = True,
+        clusters: Optional[List[str]] = None
+    ) -> Dict[str, List[ServiceInstance]]:
+        """
+        并发获取多个服务的实例列表
+        
+        Args:
+            service_names: 服务名称列表，重复的服务名只查询一次
+            group_name: 服务分组
+            healthy_only: 是否只返回健康实例
+            clusters: 集群列表
+            
+        Returns:
+            Dict[str, List[ServiceInstance]]: 服务名称到服务实例列表的映射
+        """
+        names = list(dict.fromkeys(service_names))
+        results = await asyncio.gather(*[
+            self.get_service_instances(
+                service_name=name,
+                group_name=group_name,
+                healthy_only=healthy_only,
+                clusters=clusters
+            )
+            for name in names
+        ])
+        return dict(zip(names, results))
+    
     async def choose_one_instance(
         self,
         service_name: str,
@@ -347,8 +411,8 @@ class NacosClientManager:
             data_id: 配置ID
             callback: 配置变更回调函数
             group: 配置分组
-            namespace: 命名空间ID
-            content_type: 内容类型
+            namespace: 命名空间ID（监听器使用配置中心客户端的命名空间，保留该参数以兼容旧调用）
+            content_type: 内容类型（保留该参数以兼容旧调用）
             
         Returns:
             bool: 添加是否成功
@@ -356,9 +420,7 @@ class NacosClientManager:
         listener = ConfigListener(
             data_id=data_id,
             group=group,
-            namespace=namespace,
-            callback=callback,
-            content_type=content_type
+            callback=callback
         )
         return await self.config.add_listener(listener)
 
@@ -378,7 +440,9 @@ class NacosClientManager:
             Optional[NacosClientManager]: Nacos客户端管理器实例
         """
         if cls._instance is None:
-            cls._instance = NacosClientManager()
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
         return cls._instance
 
     @classmethod
@@ -1,6 +1,3 @@
-from os import name
-import time
-import threading
 from typing import Dict, Optional
 from v2.nacos import NacosNamingService
 from my_fastapi_nacos.utils.exceptions import ServiceRegistrationError
@@ -34,9 +31,6 @@ class ServiceRegistry:
         self.username = username
         self.password = password
         self.registered_instances: Dict[str, Dict] = {}  # 存储已注册的实例信息
-        self.heartbeat_threads: Dict[str, threading.Thread] = {}  # 存储心跳线程
-        self.heartbeat_stop_events: Dict[str, threading.Event] = {}  # 存储心跳停止事件
-        self.heartbeat_interval = 5  # 心跳间隔，单位：秒
     
     async def register_service(self,
         service_name: str,
@@ -5,11 +5,15 @@ HTTP客户端,类似OpenFeign
 from abc import ABC, abstractmethod
 import asyncio
 from dataclasses import dataclass
-from typing import Optional, Any
+from typing import Dict, NamedTuple, Optional, Any, Tuple
 import enum
+import functools
 import httpx
 import inspect
+import orjson
+import re
 from pydantic import BaseModel
+from my_fastapi_nacos.utils.log_utils import log
 
 class MediaType(enum.Enum):
   """
@@ -25,6 +29,31 @@ class MediaType(enum.Enum):
   PNG = "image/png"
   HTML = "text/html"
 
+# 路径参数正则表达式: {name}
+PATH_PARAM_PATTERN = re.compile(r'\{([^}]+)\}')
+
+class _FeignMeta(NamedTuple):
+  """请求方法装饰器记录的HTTP元数据"""
+  http_method: str
+  path: str
+  content_type: str
+
+def _mark_feign_method(func, http_method: str, path: str, content_type: MediaType):
+  """
+  在方法上记录HTTP元数据，供FeignClient装饰类时一次性读取
+
+  Args:
+      func: 被装饰的方法
+      http_method (str): HTTP请求方法
+      path (str): 请求路径
+      content_type (MediaType): 请求的Content-Type
+
+  Returns:
+      被装饰的方法本身
+  """
+  func._feign_meta = _FeignMeta(http_method, path, content_type.value)
+  return func
+
 """
 请求方法装饰器
 """
@@ -37,9 +66,7 @@ def GetMapping(path: str):
       path (str): 请求路径，例如 "/users/{user_id}"
   """
   def decorator(func):
-    func._http_method = "GET"
-    func._path = path
-    return func
+    return _mark_feign_method(func, "GET", path, MediaType.JSON)
   return decorator
 
 def PostMapping(path: str, content_type: MediaType = MediaType.JSON):
@@ -50,10 +77,7 @@ def PostMapping(path: str, content_type: MediaType = MediaType.JSON):
       path (str): 请求路径，例如 "/users"
   """
   def decorator(func):
-    func._http_method = "POST"
-    func._path = path
-    func._content_type = content_type.value
-    return func
+    return _mark_feign_method(func, "POST", path, content_type)
   return decorator
 
 def PutMapping(path: str, content_type: MediaType = MediaType.JSON):
@@ -64,10 +88,7 @@ def PutMapping(path: str, content_type: MediaType = MediaType.JSON):
       path (str): 请求路径，例如 "/users/{user_id}"
   """
   def decorator(func):
-    func._http_method = "PUT"
-    func._path = path
-    func._content_type = content_type.value
-    return func
+    return _mark_feign_method(func, "PUT", path, content_type)
   return decorator
 
 def DeleteMapping(path: str, content_type: MediaType = MediaType.JSON):
@@ -78,10 +99,7 @@ def DeleteMapping(path: str, content_type: MediaType = MediaType.JSON):
       path (str): 请求路径，例如 "/users/{user_id}"
   """
   def decorator(func):
-    func._http_method = "DELETE"
-    func._path = path
-    func._content_type = content_type.value
-    return func
+    return _mark_feign_method(func, "DELETE", path, content_type)
   return decorator
 
 def PatchMapping(path: str, content_type: MediaType = MediaType.JSON):
@@ -92,13 +110,37 @@ def PatchMapping(path: str, content_type: MediaType = MediaType.JSON):
       path (str): 请求路径，例如 "/users/{user_id}"
   """
   def decorator(func):
-    func._http_method = "PATCH"
-    func._path = path
-    func._content_type = content_type.value
-    return func
+    return _mark_feign_method(func, "PATCH", path, content_type)
   return decorator
 
 
+def _resolve_body_kwarg(http_method: str, content_type: str) -> Optional[str]:
+  """
+  根据请求方法和Content-Type确定请求参数对应的httpx参数名
+
+  Args:
+      http_method (str): HTTP请求方法
+      content_type (str): 请求的Content-Type
+
+  Returns:
+      Optional[str]: httpx请求参数名，为None时不发送请求参数
+  """
+  if http_method in ("GET", "DELETE"):
+    # 查询参数
+    return "params"
+  if http_method in ("POST", "PUT", "PATCH"):
+    if content_type == MediaType.JSON.value:
+      # 请求的JSON数据，由orjson序列化后作为请求体发送
+      return "content"
+    elif content_type == MediaType.FORM_URLENCODED.value:
+      # 请求的表单数据
+      return "data"
+    elif content_type == MediaType.MULTIPART_FORM_DATA.value:
+      # 请求的多部分表单数据
+      return "files"
+  return None
+
+
 class FeignConfig(ABC):
   """
   Feign客户端配置基类，用于http请求前做额外处理
@@ -116,6 +158,50 @@ class FeignConfig(ABC):
     """
     pass
 
+# 共享的HTTP客户端，按(base_url, timeout, http2, 事件循环)复用连接池，客户端的连接只能在创建它的事件循环中使用
+_clients: Dict[Tuple[str, float, bool, asyncio.AbstractEventLoop], httpx.AsyncClient] = {}
+
+def _get_or_create_client(base_url: str, timeout: float, http2: bool = False) -> httpx.AsyncClient:
+  """
+  获取共享的HTTP客户端，不存在或已关闭时创建
+
+  Args:
+      base_url (str): 服务的基础URL
+      timeout (float): 请求超时时间，单位为秒
+      http2 (bool, optional): 是否启用HTTP/2。默认值为False。
+
+  Returns:
+      httpx.AsyncClient: 共享的HTTP客户端
+  """
+  key = (base_url, timeout, http2, asyncio.get_running_loop())
+  client = _clients.get(key)
+  if client is None or client.is_closed:
+    _discard_stale_clients()
+    client = httpx.AsyncClient(
+      base_url=base_url,
+      timeout=timeout,
+      http2=http2,
+      limits=httpx.Limits(max_keepalive_connections=100, max_connections=200)
+    )
+    _clients[key] = client
+  return client
+
+def _discard_stale_clients():
+  """
+  丢弃事件循环已关闭的共享HTTP客户端，其连接已无法使用
+  """
+  for key in [key for key in _clients if key[-1].is_closed()]:
+    del _clients[key]
+
+async def close_feign_clients():
+  """
+  关闭当前事件循环的共享HTTP客户端，应在应用关闭时调用
+  """
+  loop = asyncio.get_running_loop()
+  clients = [_clients.pop(key) for key in list(_clients) if key[-1] is loop]
+  _discard_stale_clients()
+  await asyncio.gather(*[client.aclose() for client in clients], return_exceptions=True)
+
 # 声明式客户端装饰器
 class FeignClient:
   """
@@ -125,9 +211,15 @@ class FeignClient:
       base_url (str): 服务的基础URL，例如 "http://localhost:8000"。 如果使用服务名，则会自动从Nacos获取服务实例的URL
       timeout (float, optional): 请求超时时间，单位为秒。默认值为5秒。
       config (Optional[FeignConfig], optional): Feign客户端配置对象。默认值为None。
+      http2 (bool, optional): 是否启用HTTP/2，需要安装h2且服务使用https，http服务仍使用HTTP/1.1。默认值为False。
   """
 
-  def __init__(self, base_url: str, timeout: float = 5, config: Optional[FeignConfig] = None):
+  def __init__(self, base_url: str, timeout: float = 5, config: Optional[FeignConfig] = None, http2: bool = False):
+    if http2:
+      try:
+        import h2  # noqa: F401
+      except ImportError as e:
+        raise ImportError("启用HTTP/2需要安装h2: pip install \"my-fastapi-nacos[http2]\"") from e
     if base_url.startswith("http"):
       self.base_url = base_url
       self.service_name = None
@@ -136,6 +228,36 @@ class FeignClient:
       self.service_name = base_url
     self.timeout = timeout
     self.config = config
+    self.http2 = http2
+
+  @staticmethod
+  async def batch(*coros, concurrency: int = 20) -> list:
+    """
+    并发执行多个Feign调用，同一服务的请求共享HTTP客户端的连接池
+
+    Args:
+        *coros: Feign方法调用返回的协程对象
+        concurrency (int, optional): 最大并发数。默认值为20。
+
+    Returns:
+        list: 与传入顺序一致的结果列表，调用失败的位置为对应的异常对象
+
+    Raises:
+        ValueError: 最大并发数小于1
+    """
+    if concurrency < 1:
+      # 关闭传入的协程，避免未等待告警
+      for coro in coros:
+        if inspect.iscoroutine(coro):
+          coro.close()
+      raise ValueError(f"最大并发数必须大于等于1: {concurrency}")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def guarded(coro):
+      async with semaphore:
+        return await coro
+
+    return await asyncio.gather(*[guarded(coro) for coro in coros], return_exceptions=True)
     
   async def _resolve_service_name(self) -> str:
     """
@@ -167,36 +289,45 @@ class FeignClient:
   def __call__(self, cls) -> Any:
     feign_client = self  # 保存对FeignClient实例的引用
     timeout = self.timeout
+    http2 = self.http2
     config = self.config
     # 遍历类的所有方法
     for name, method in cls.__dict__.items():
       # 只处理被GetMapping/PostMapping/PutMapping/DeleteMapping标记的方法
-      if callable(method) and not name.startswith('_') and hasattr(method, '_http_method'):
+      if callable(method) and not name.startswith('_') and hasattr(method, '_feign_meta'):
         # 提取方法的HTTP元数据
-        http_method = method._http_method
-        path = method._path
-        content_type = getattr(method, "_content_type", MediaType.JSON.value)
+        http_method, path, content_type = method._feign_meta
 
         # 定义新的方法用于实现HTTP请求
         def create_feign_method(http_method, path, content_type, original_method):
-          # 获取原始方法的签名，用于映射位置参数到参数名
-          sig = inspect.signature(original_method)
+          # 获取原始方法的参数名列表（排除self），用于映射位置参数到参数名
+          param_names = tuple(inspect.signature(original_method).parameters)[1:]
+          # 预先拆分路径模板，偶数位为字面量片段，奇数位为路径参数名
+          path_segments = PATH_PARAM_PATTERN.split(path)
+          path_param_names = tuple(dict.fromkeys(path_segments[1::2]))
+          # 请求方法和Content-Type在装饰时已确定，预先选定请求参数的发送方式
+          body_kwarg = _resolve_body_kwarg(http_method, content_type)
+          # 请求头在所有调用间共享，httpx.Request会复制为自身的Headers，FeignConfig修改请求头不影响此处
+          request_headers = {"Content-Type": content_type}
+
+          # config在装饰时已确定，预先选定发送方式，避免每次调用都判断是否需要预处理
+          if config is None:
+            async def send_request(client: httpx.AsyncClient, url: str, request_kwargs: dict) -> httpx.Response:
+              return await client.request(http_method, url, **request_kwargs)
+          else:
+            async def send_request(client: httpx.AsyncClient, url: str, request_kwargs: dict) -> httpx.Response:
+              # 应用Feign配置时才需要手动构建请求对象
+              request = client.build_request(http_method, url, **request_kwargs)
+              request = await config.pre_request(request)
+              return await client.send(request)
           
+          # 保留原方法的名称、文档和签名，便于调试和内省
+          @functools.wraps(original_method)
           async def feign_method(self, *args, **kwargs):
             try:
               # 提取实际参数（处理位置参数和dataclass对象）
-              actual_kwargs = {}
-              
-              # 处理位置参数，将它们映射到参数名
-              if args:
-                # 获取参数名列表（排除self）
-                param_names = list(sig.parameters.keys())[1:]  # 排除第一个参数self
-                
-                # 将位置参数映射到参数名
-                for i, arg in enumerate(args):
-                  if i < len(param_names):
-                    param_name = param_names[i]
-                    actual_kwargs[param_name] = arg
+              # 将位置参数映射到参数名，多余的位置参数忽略
+              actual_kwargs = dict(zip(param_names, args))
               
               # 处理关键字参数
               for key, value in kwargs.items():
@@ -216,44 +347,27 @@ class FeignClient:
               # 解析服务名（如果需要）
               base_url = await feign_client._resolve_service_name()
               
-              # 构建完整URL,替换路径参数（如 /user/{id}）
-              url = path.format(**actual_kwargs)
+              # 构建完整URL,替换路径参数（如 /user/{id}），路径参数不再作为请求参数发送
+              path_values = {name: actual_kwargs.pop(name) for name in path_param_names}
+              url = "".join([
+                segment if i % 2 == 0 else str(path_values[segment])
+                for i, segment in enumerate(path_segments)
+              ])
               # 构造请求参数
               request_kwargs = {}
               
-              # 使用传入的 content_type 参数
-              request_headers = {"Content-Type": content_type}
               request_kwargs["headers"] = request_headers
-              if http_method == "GET":
-                # GET请求的查询参数
-                request_kwargs["params"] = actual_kwargs
-              elif http_method == "POST" or http_method == "PUT" or http_method == "PATCH":
-                if content_type == MediaType.JSON.value:
-                  # 请求的JSON数据
-                  request_kwargs["json"] = actual_kwargs
-                elif content_type == MediaType.FORM_URLENCODED.value:
-                  # 请求的表单数据
-                  request_kwargs["data"] = actual_kwargs
-                elif content_type == MediaType.MULTIPART_FORM_DATA.value:
-                  # 请求的多部分表单数据
-                  request_kwargs["files"] = actual_kwargs
-              elif http_method == "DELETE":
-                request_kwargs["params"] = actual_kwargs
-
-              # 创建HTTP请求
-              # 处理base_url以/结尾的情况
+              if body_kwarg == "content":
+                request_kwargs["content"] = orjson.dumps(actual_kwargs, option=orjson.OPT_NON_STR_KEYS)
+              elif body_kwarg:
+                request_kwargs[body_kwarg] = actual_kwargs
+
+              # 处理base_url以/结尾的情况，保证同一服务复用同一个HTTP客户端
               if base_url.endswith('/'):
                 base_url = base_url[:-1]
-              if url.startswith('/'):
-                url = url[1:]
-              full_url = f"{base_url}/{url}"
-              request = httpx.Request(http_method, full_url, **request_kwargs)
-              # 应用Feign配置（如果有）
-              if config:
-                request = await config.pre_request(request)
-              # 发送请求
-              async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.send(request)
+              # 使用共享的HTTP客户端发送请求，复用连接池，url相对于客户端的base_url
+              client = _get_or_create_client(base_url, timeout, http2)
+              response = await send_request(client, url, request_kwargs)
               # 检查响应状态码
               response.raise_for_status()
               
@@ -262,7 +376,7 @@ class FeignClient:
               
               if 'application/json' in response_content_type:
                   # 返回JSON格式数据
-                  return response.json()
+                  return orjson.loads(response.content)
               elif 'text/' in response_content_type:
                   # 返回文本格式数据
                   return response.text
@@ -271,11 +385,12 @@ class FeignClient:
                   return response.content
             except httpx.HTTPStatusError as e:
               # 处理HTTP状态错误（4xx, 5xx）
-              print(f"HTTP错误: {e.response.status_code} - {e.response.text}")
+              # 响应内容仅在日志级别生效时才读取
+              log.opt(lazy=True).error("HTTP错误: {} - {}", lambda: e.response.status_code, lambda: e.response.text)
               raise e
             except httpx.RequestError as e:
               # 处理请求错误（网络问题等）
-              print(f"请求错误: {e}")
+              log.error("请求错误: {}", e)
               raise e
           return feign_method
 
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from typing import Optional, Callable
 from pydantic import BaseModel, Field
 
@@ -17,8 +18,12 @@ class ConfigResponse(BaseModel):
     type: Optional[str] = Field(default="text")
 
 
-class ConfigListener(BaseModel):
-    """配置监听器模型"""
+@dataclass(slots=True, frozen=True)
+class ConfigListener:
+    """配置监听器模型，持有回调函数，不需要pydantic校验
+
+    该类为普通dataclass而非pydantic模型：不支持model_dump等BaseModel方法，构造时传入多余的参数会抛出TypeError
+    """
     data_id: str
     group: str
-    callback: Callable[[str], None]
\ No newline at end of file
+    callback: Callable[[str], None]
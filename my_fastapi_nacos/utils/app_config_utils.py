@@ -2,12 +2,21 @@
 项目配置文件解析工具
 """
 
+import functools
+import json
 import os
 import sys
+import tempfile
 import yaml
 import re
 from my_fastapi_nacos.utils.env_utils import get_var
-from typing import Dict, Any, Union
+from typing import Dict, Any, Optional, Union
+
+try:
+    # 优先使用LibYAML实现的C加速解析器
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
 
 # 环境变量引用正则表达式: ${ENV_VAR:default_value}
 ENV_VAR_PATTERN = re.compile(r'\$\{([^:}]+)(?::([^}]*))?\}')
@@ -15,6 +24,29 @@ ENV_VAR_PATTERN = re.compile(r'\$\{([^:}]+)(?::([^}]*))?\}')
 # 配置参数引用正则表达式: ${config.key}
 CONFIG_VAR_PATTERN = re.compile(r'\$\{([a-zA-Z0-9_.]+)\}')
 
+# 配置文件YAML解析结果（替换引用之前）的缓存文件后缀，缓存文件与配置文件位于同一目录
+CONFIG_CACHE_SUFFIX = ".cache.json"
+
+
+@functools.lru_cache(maxsize=1024)
+def _substitute_env_string(value: str) -> str:
+    """替换字符串中的环境变量引用，结果按字符串缓存
+    
+    缓存在每次解析配置前清空，保证单次解析内环境变量取值一致
+    
+    Args:
+        value: 要处理的字符串
+        
+    Returns:
+        替换后的字符串
+    """
+    def replace_env_match(match: re.Match) -> str:
+        env_var = match.group(1)
+        default = match.group(2) or ''
+        return get_var(env_var, default)
+    
+    return ENV_VAR_PATTERN.sub(replace_env_match, value)
+
 
 def substitute_env_vars(value: Union[str, Dict[str, Any], Any], config_dict: Dict[str, Any] = None) -> Union[str, Dict[str, Any], Any]:
     """递归替换字符串中的环境变量引用和配置参数引用
@@ -27,6 +59,10 @@ def substitute_env_vars(value: Union[str, Dict[str, Any], Any], config_dict: Dic
         替换后的对应值
     """
     if isinstance(value, str):
+        # 不含引用的字符串无需替换
+        if "${" not in value:
+            return value
+        
         # 首先替换配置参数引用
         def replace_config_match(match: re.Match) -> str:
             config_key = match.group(1)
@@ -44,14 +80,11 @@ def substitute_env_vars(value: Union[str, Dict[str, Any], Any], config_dict: Dic
         
         # 替换配置参数引用
         result = CONFIG_VAR_PATTERN.sub(replace_config_match, value)
+        if "${" not in result:
+            return result
         
         # 然后替换环境变量引用
-        def replace_env_match(match: re.Match) -> str:
-            env_var = match.group(1)
-            default = match.group(2) or ''
-            return get_var(env_var, default)
-        
-        return ENV_VAR_PATTERN.sub(replace_env_match, result)
+        return _substitute_env_string(result)
     elif isinstance(value, dict):
         # 递归处理字典
         return {
@@ -67,7 +100,10 @@ def substitute_env_vars(value: Union[str, Dict[str, Any], Any], config_dict: Dic
 
 
 class AppConfig:
-    """配置对象类，提供属性访问和字典访问两种方式"""
+    """配置对象类，提供属性访问和字典访问两种方式
+    
+    配置对象创建后视为不可变，请勿修改 to_dict 返回的字典
+    """
     
     def __init__(self, config_dict: Dict[str, Any]):
         """初始化配置对象
@@ -76,25 +112,39 @@ class AppConfig:
             config_dict: 配置字典
         """
         self._config = config_dict
-        # 将字典转换为属性
-        self._convert_dict_to_attrs(config_dict)
+        # 扁平化索引，格式: {"db.host": value}，首次调用 get 时构建
+        self._flat: Optional[Dict[str, Any]] = None
     
-    def _convert_dict_to_attrs(self, data: Dict[str, Any], prefix: str = ""):
-        """将字典递归转换为对象属性
+    def __getattr__(self, name: str) -> Any:
+        """支持属性式访问，嵌套字典在首次访问时转换为配置对象并缓存
         
         Args:
-            data: 要转换的字典数据
-            prefix: 属性前缀（用于嵌套结构）
+            name: 配置键名
+            
+        Returns:
+            配置值
+        """
+        config = self.__dict__.get("_config")
+        if config is None or name not in config:
+            raise AttributeError(name)
+        value = config[name]
+        if isinstance(value, dict):
+            value = AppConfig(value)
+            self.__dict__[name] = value
+        return value
+    
+    def _build_flat(self, data: Dict[str, Any], prefix: str = ""):
+        """递归构建扁平化索引，中间层级的键同样可以访问
+        
+        Args:
+            data: 要索引的字典数据
+            prefix: 键前缀（用于嵌套结构）
         """
         for key, value in data.items():
-            attr_name = f"{prefix}{key}" if prefix else key
+            flat_key = f"{prefix}.{key}" if prefix else str(key)
+            self._flat[flat_key] = value
             if isinstance(value, dict):
-                # 递归处理嵌套字典
-                nested_attr = AppConfig(value)
-                setattr(self, attr_name, nested_attr)
-            else:
-                # 直接设置简单值
-                setattr(self, attr_name, value)
+                self._build_flat(value, flat_key)
     
     def get(self, key: str, default: Any = None) -> Any:
         """获取配置值（类似字典的get方法）
@@ -106,20 +156,10 @@ class AppConfig:
         Returns:
             配置值或默认值
         """
-        keys = key.split('.')
-        value = self._config
-        
-        try:
-            for k in keys:
-                if isinstance(value, dict):
-                    value = value[k]
-                elif hasattr(value, k):
-                    value = getattr(value, k)
-                else:
-                    return default
-            return value
-        except (KeyError, AttributeError):
-            return default
+        if self._flat is None:
+            self._flat = {}
+            self._build_flat(self._config)
+        return self._flat.get(key, default)
     
     def __getitem__(self, key: str) -> Any:
         """支持字典式访问
@@ -157,7 +197,7 @@ class AppConfig:
         Returns:
             配置的字符串表示
         """
-        return yaml.dump(self._config, default_flow_style=False, allow_unicode=True)
+        return yaml.dump(self._config, Dumper=_Dumper, default_flow_style=False, allow_unicode=True)
 
 def parse_yaml_content(config_dict: Dict[str, Any]) -> Dict[str, Any]:
     """解析 YAML 内容
@@ -168,6 +208,9 @@ def parse_yaml_content(config_dict: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         解析后的配置字典
     """
+    # 环境变量可能已变化，清空上次解析的替换缓存
+    _substitute_env_string.cache_clear()
+    
     # Process the config with multiple iterations to handle dependencies
     max_iterations = 10
     current_config = config_dict
@@ -210,14 +253,14 @@ def parse_yaml_content(config_dict: Dict[str, Any]) -> Dict[str, Any]:
     
     return current_config
 
-def read_yaml_file(file_path: str) -> Dict[str, Any]:
-    """读取 YAML 配置文件并替换环境变量
+def load_yaml_file(file_path: str) -> Any:
+    """读取 YAML 配置文件，不替换环境变量和配置参数引用
     
     Args:
         file_path: YAML 文件路径
         
     Returns:
-        配置字典
+        YAML 解析结果
         
     Raises:
         FileNotFoundError: 文件不存在
@@ -229,14 +272,99 @@ def read_yaml_file(file_path: str) -> Dict[str, Any]:
     
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            config_dict = yaml.safe_load(f)
-            # 解析 YAML 内容
-            return parse_yaml_content(config_dict)
+            return yaml.load(f, Loader=_Loader)
     except yaml.YAMLError as e:
         raise yaml.YAMLError(f"YAML 格式错误: {e}")
     except IOError as e:
         raise IOError(f"文件读取错误: {e}")
 
+def read_yaml_file(file_path: str) -> Dict[str, Any]:
+    """读取 YAML 配置文件并替换环境变量
+    
+    Args:
+        file_path: YAML 文件路径
+        
+    Returns:
+        配置字典
+        
+    Raises:
+        FileNotFoundError: 文件不存在
+        yaml.YAMLError: YAML 格式错误
+        IOError: 文件读取错误
+    """
+    # 解析 YAML 内容
+    return parse_yaml_content(load_yaml_file(file_path))
+
+def _config_cache_fingerprint(file_path: str) -> Dict[str, Any]:
+    """计算配置缓存的校验信息：配置文件的修改时间和大小
+    
+    Args:
+        file_path: YAML 文件路径
+        
+    Returns:
+        校验信息字典
+    """
+    stat = os.stat(file_path)
+    return {
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+    }
+
+def read_config_cache(file_path: str) -> Optional[Dict[str, Any]]:
+    """读取配置文件的 YAML 解析结果缓存，配置文件变化时缓存失效
+    
+    缓存内容为替换引用之前的原始配置，使用前需经 parse_yaml_content 处理
+    
+    Args:
+        file_path: YAML 文件路径
+        
+    Returns:
+        缓存的原始配置字典，缓存不存在或已失效时返回 None
+    """
+    try:
+        with open(file_path + CONFIG_CACHE_SUFFIX, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get("fingerprint") != _config_cache_fingerprint(file_path):
+            return None
+        return cache.get("config")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def write_config_cache(file_path: str, config_dict: Dict[str, Any], fingerprint: Dict[str, Any]) -> None:
+    """将配置文件的 YAML 解析结果写入缓存文件，无法无损转换为 JSON、写入失败或配置文件已变化时跳过
+    
+    只应缓存替换引用之前的原始配置，避免环境变量中的敏感信息写入磁盘
+    
+    Args:
+        file_path: YAML 文件路径
+        config_dict: 替换引用之前的原始配置字典
+        fingerprint: 读取配置文件之前计算的校验信息
+    """
+    try:
+        content = json.dumps(
+            {"fingerprint": fingerprint, "config": config_dict},
+            ensure_ascii=False
+        )
+        # 日期、非字符串键等无法经 JSON 还原的配置不缓存
+        if json.loads(content)["config"] != config_dict:
+            return
+        # 先写临时文件再替换，避免并发启动的进程读到不完整的缓存
+        cache_dir = os.path.dirname(os.path.abspath(file_path))
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+            # 读取后配置文件又被修改时，解析结果已过期，不写入缓存
+            if _config_cache_fingerprint(file_path) != fingerprint:
+                os.unlink(tmp_path)
+                return
+            os.replace(tmp_path, file_path + CONFIG_CACHE_SUFFIX)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except (OSError, TypeError, ValueError):
+        pass
+
 def merge_config(config_dict: Dict[str, Any], env_prefix: str = "") -> Dict[str, Any]:
     """合并配置字典和环境变量
     
@@ -296,10 +424,25 @@ def load_config() -> AppConfig:
         config_path = get_var("FASTAPI_NACOS_CONFIG_FILE", os.path.join(root_dir, "conf", "app.yml"))
         print(f"正在加载配置文件: {config_path}")
         
-        # 读取 YAML 配置
-        config_dict = read_yaml_file(config_path)
-        if config_dict is None:
-            config_dict = {}
+        # 开启缓存且配置文件未变化时直接使用缓存的 YAML 解析结果
+        use_cache = get_var("FASTAPI_NACOS_CONFIG_CACHE", "false").lower() in ('true', '1', 'yes')
+        raw_config = read_config_cache(config_path) if use_cache else None
+        if raw_config is None:
+            # 读取配置文件之前计算校验信息，读取期间文件被修改时缓存不会与新文件匹配
+            fingerprint = None
+            if use_cache:
+                try:
+                    fingerprint = _config_cache_fingerprint(config_path)
+                except OSError:
+                    pass
+            # 读取 YAML 配置
+            raw_config = load_yaml_file(config_path)
+            if raw_config is None:
+                raw_config = {}
+            if fingerprint is not None:
+                write_config_cache(config_path, raw_config, fingerprint)
+        # 环境变量和配置参数引用每次加载时重新替换
+        config_dict = parse_yaml_content(raw_config)
         
         # 合并环境变量
         # merged_config = merge_config(config_dict)
@@ -9,6 +9,9 @@ root_dir = os.path.dirname(startup_file)
 # 加载项目根目录下的.env文件
 load_dotenv(os.path.join(root_dir, '.env'), override=True)
 
+# 环境变量映射，直接引用os.environ以便读取运行期间的最新值
+_ENV = os.environ
+
 # 注册中心配置
 discovery_server_addresses = os.getenv("NACOS_DISCOVERY_SERVER_ADDRESSES")
 discovery_namespace = os.getenv("NACOS_DISCOVERY_NAMESPACE")
@@ -31,4 +34,4 @@ def get_var(var_name: str, default: str = None) -> str:
     Returns:
         环境变量值或默认值
     """
-    return os.getenv(var_name, default)
+    return _ENV.get(var_name, default)
@@ -15,42 +15,62 @@ if log_file and not os.path.isabs(log_file):
     log_file = os.path.join(root_dir, log_file)
 
 log_dir = os.path.dirname(log_file)
-if log_dir:  # 避免空路径
+
+# loguru默认添加的控制台输出编号
+_DEFAULT_HANDLER_ID = 0
+_configured = False
+
+def configure_logging():
+  """
+  配置日志输出，由应用启动时调用，重复调用不会重复添加输出
+
+  只移除loguru默认的控制台输出，保留用户自行添加的输出
+  """
+  global _configured
+  if _configured:
+    return
+  _configured = True
+  if log_dir:  # 避免空路径
     os.makedirs(log_dir, exist_ok=True)
+  try:
+    logger.remove(_DEFAULT_HANDLER_ID)
+  except ValueError:
+    # 默认输出已被移除
+    pass
+  # 添加控制台输出格式
+  logger.add(sys.stdout, level=log_level,
+    format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
+            "{process.name} | " # 进程名
+            "{thread.name} | " # 线程名
+            "<level>{level}</level> | "
+            "<cyan>{module}</cyan>.<cyan>{function}</cyan>" # 模块名.方法名
+            ":<cyan>{line}</cyan>: " # 行号
+            "- <level>{message}</level>" # 日志内容
+  )
+
+  # 输出到文件的格式，通过后台队列写入，避免磁盘IO阻塞事件循环
+  logger.add(
+    log_file,
+    level=log_level,
+    rotation="100 MB", # 每个日志文件最大100MB
+    retention="10 days", # 保留10天的日志文件
+    encoding="utf-8",
+    enqueue=True, # 异步写入
+    backtrace=False, # 异常时不回溯超出捕获点的调用栈
+    diagnose=False, # 异常时不输出变量值，避免敏感信息写入文件
+    format="{time:YYYY-MM-DD HH:mm:ss} | "
+            "{level} | "
+            "{module}.{function}" # 模块名.方法名
+            ":{line}: " # 行号
+            "- {message}" # 日志内容
+  )
 
 class MyLogger:
   def __init__(self):
     self.logger = logger
-    # 清空所有配置
-    self.logger.remove()
-    # 添加控制台输出格式
-    self.logger.add(sys.stdout, level=log_level,
-      format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
-              "{process.name} | " # 进程名
-              "{thread.name} | " # 线程名
-              "<level>{level}</level> | "
-              "<cyan>{module}</cyan>.<cyan>{function}</cyan>" # 模块名.方法名
-              ":<cyan>{line}</cyan>: " # 行号
-              "- <level>{message}</level>" # 日志内容
-    )
-
-    # 输出到文件的格式
-    self.logger.add(
-      log_file,
-      level=log_level,
-      rotation="100 MB", # 每个日志文件最大100MB
-      retention="10 days", # 保留10天的日志文件
-      encoding="utf-8",
-      format="{time:YYYY-MM-DD HH:mm:ss} | "
-              "{process.name} | " # 进程名
-              "{thread.name} | " # 线程名
-              "{level} | "
-              "{module}.{function}" # 模块名.方法名
-              ":{line}: " # 行号
-              "- {message}" # 日志内容
-    )
+    configure_logging()
 
   def get_logger(self):
     return self.logger
 
-log = MyLogger().get_logger()
\ No newline at end of file
+log = logger
@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+from my_fastapi_nacos.utils import app_config_utils
+from my_fastapi_nacos.utils.app_config_utils import CONFIG_CACHE_SUFFIX, load_config
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    path = tmp_path / "app.yml"
+    path.write_text("nacos:\n  password: ${TEST_NACOS_PASSWORD:default}\n  user: admin\n", encoding="utf-8")
+    monkeypatch.setenv("FASTAPI_NACOS_CONFIG_FILE", str(path))
+    monkeypatch.setenv("TEST_NACOS_PASSWORD", "secret-1")
+    return path
+
+
+def cache_path(path):
+    return str(path) + CONFIG_CACHE_SUFFIX
+
+
+def test_cache_is_disabled_by_default(config_file, monkeypatch):
+    monkeypatch.delenv("FASTAPI_NACOS_CONFIG_CACHE", raising=False)
+    assert load_config().get("nacos.password") == "secret-1"
+    assert not os.path.exists(cache_path(config_file))
+
+
+def test_cache_does_not_store_substituted_values(config_file, monkeypatch):
+    monkeypatch.setenv("FASTAPI_NACOS_CONFIG_CACHE", "true")
+    assert load_config().get("nacos.password") == "secret-1"
+    with open(cache_path(config_file), encoding="utf-8") as f:
+        cached = f.read()
+    assert "${TEST_NACOS_PASSWORD:default}" in cached
+    assert "secret-1" not in cached
+
+    # 环境变量变化后从缓存加载时重新替换
+    monkeypatch.setenv("TEST_NACOS_PASSWORD", "secret-2")
+    assert load_config().get("nacos.password") == "secret-2"
+
+
+def test_cache_is_invalidated_when_config_file_changes(config_file, monkeypatch):
+    monkeypatch.setenv("FASTAPI_NACOS_CONFIG_CACHE", "true")
+    assert load_config().get("nacos.user") == "admin"
+    mtime_ns = os.stat(config_file).st_mtime_ns
+
+    # 内容长度不变，仅修改时间变化
+    config_file.write_text("nacos:\n  password: ${TEST_NACOS_PASSWORD:default}\n  user: guest\n", encoding="utf-8")
+    os.utime(config_file, ns=(mtime_ns + 1_000_000_000, mtime_ns + 1_000_000_000))
+    assert load_config().get("nacos.user") == "guest"
+
+    # 大小变化
+    config_file.write_text("nacos:\n  user: someone-else\n", encoding="utf-8")
+    assert load_config().get("nacos.user") == "someone-else"
+    assert load_config().get("nacos.password") is None
+
+
+def test_cache_is_not_written_when_file_changes_while_loading(config_file, monkeypatch):
+    monkeypatch.setenv("FASTAPI_NACOS_CONFIG_CACHE", "true")
+    config_file.write_text("a: 1\n", encoding="utf-8")
+    load_yaml_file = app_config_utils.load_yaml_file
+
+    def load_then_modify(file_path):
+        # 解析完成后、写入缓存之前配置文件被修改
+        raw_config = load_yaml_file(file_path)
+        config_file.write_text("a: 22\n", encoding="utf-8")
+        return raw_config
+
+    monkeypatch.setattr(app_config_utils, "load_yaml_file", load_then_modify)
+    assert load_config().get("a") == 1
+    monkeypatch.setattr(app_config_utils, "load_yaml_file", load_yaml_file)
+    assert load_config().get("a") == 22
+    assert load_config().get("a") == 22
@@ -0,0 +1,225 @@
+import asyncio
+
+import pytest
+from loguru import logger
+
+from my_fastapi_nacos.core.config import ConfigManager
+from my_fastapi_nacos.models.config import ConfigListener
+from my_fastapi_nacos.utils.exceptions import ConfigListenerError
+
+
+class FakeConfigService:
+    """模拟Nacos配置服务，记录获取次数和订阅的监听回调"""
+
+    def __init__(self, contents):
+        self.contents = contents
+        self.calls = 0
+        self.gate = None
+        self.error = None
+        self.subscribe_error = None
+        self.listeners = []
+
+    async def get_config(self, param):
+        self.calls += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        return self.contents[param.data_id]
+
+    async def add_listener(self, data_id, group, listener):
+        if self.gate is not None:
+            await self.gate.wait()
+        # 订阅错误只触发一次
+        error, self.subscribe_error = self.subscribe_error, None
+        if error is not None:
+            raise error
+        self.listeners.append((data_id, group, listener))
+
+    async def remove_listener(self, data_id, group, listener):
+        self.listeners.remove((data_id, group, listener))
+
+
+def make_manager(contents):
+    service = FakeConfigService(contents)
+    manager = ConfigManager(service, logger, "127.0.0.1:8848", "", "", "")
+    return manager, service
+
+
+@pytest.mark.asyncio
+async def test_concurrent_get_config_shares_one_fetch():
+    manager, service = make_manager({"a": "x: 1"})
+    service.gate = asyncio.Event()
+    tasks = [asyncio.create_task(manager.get_config("a")) for _ in range(5)]
+    await asyncio.sleep(0)
+    service.gate.set()
+    assert await asyncio.gather(*tasks) == ["x: 1"] * 5
+    assert service.calls == 1
+    assert manager._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_cancelling_first_caller_does_not_cancel_others():
+    manager, service = make_manager({"a": "x: 1"})
+    service.gate = asyncio.Event()
+    t1 = asyncio.create_task(manager.get_config("a"))
+    t2 = asyncio.create_task(manager.get_config("a"))
+    await asyncio.sleep(0)
+    t1.cancel()
+    await asyncio.sleep(0)
+    service.gate.set()
+    assert await t2 == "x: 1"
+    assert t1.cancelled()
+    assert not t2.cancelled()
+    assert service.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_error_reaches_all_callers_and_is_not_kept():
+    manager, service = make_manager({"a": "x: 1"})
+    service.gate = asyncio.Event()
+    service.error = RuntimeError("boom")
+    tasks = [asyncio.create_task(manager.get_config("a")) for _ in range(2)]
+    await asyncio.sleep(0)
+    service.gate.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert all(type(r).__name__ == "ConfigError" for r in results)
+    assert service.calls == 1
+
+    service.error = None
+    assert await manager.get_config("a") == "x: 1"
+    assert service.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_parsed_cache_evicts_least_recently_used():
+    manager, _ = make_manager({"a": "x: 1", "b": "{\"y\": 2}", "c": "z: 3"})
+    manager.cache_max = 2
+    first = await manager.get_config_dict("a")
+    assert await manager.get_config_dict("b") == {"y": 2}
+    # 访问a使b成为最久未使用的条目
+    assert await manager.get_config_dict("a") is first
+    await manager.get_config_dict("c")
+    assert [key[2] for key in manager.parsed_cache] == ["a", "c"]
+
+
+@pytest.mark.asyncio
+async def test_only_listened_configs_are_cached():
+    manager, service = make_manager({"a": "x: 1"})
+    await manager.get_config("a")
+    await manager.get_config("a")
+    assert service.calls == 2
+
+    received = []
+    await manager.add_listener(ConfigListener(data_id="a", group="DEFAULT_GROUP", callback=lambda *args: received.append(args)))
+    await manager.get_config("a")
+    await manager.get_config("a")
+    assert service.calls == 3
+
+    # 配置变更回调更新缓存并使解析结果失效
+    assert await manager.get_config_dict("a") == {"x": 1}
+    _, _, sdk_listener = service.listeners[0]
+    await sdk_listener("", "DEFAULT_GROUP", "a", "x: 2")
+    assert len(received) == 1
+    assert await manager.get_config("a") == "x: 2"
+    assert await manager.get_config_dict("a") == {"x": 2}
+    assert service.calls == 3
+
+    await manager.remove_listener("a")
+    assert service.listeners == []
+    await manager.get_config("a")
+    assert service.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_listeners_for_same_config_share_one_subscription():
+    manager, service = make_manager({"a": "x: 1"})
+    first, second = [], []
+
+    def on_first(*args):
+        first.append(args)
+
+    async def on_second(*args):
+        second.append(args)
+
+    await manager.add_listener(ConfigListener(data_id="a", group="DEFAULT_GROUP", callback=on_first))
+    await manager.add_listener(ConfigListener(data_id="a", group="DEFAULT_GROUP", callback=on_second))
+    # 相同回调重复添加不会重复通知
+    await manager.add_listener(ConfigListener(data_id="a", group="DEFAULT_GROUP", callback=on_first))
+    assert len(service.listeners) == 1
+
+    _, _, sdk_listener = service.listeners[0]
+    await sdk_listener("", "DEFAULT_GROUP", "a", "x: 2")
+    assert len(first) == 1 and len(second) == 1
+
+    # 移除其中一个回调时保留订阅，另一个回调继续收到通知
+    assert await manager.remove_listener("a", callback=on_first)
+    assert len(service.listeners) == 1
+    await sdk_listener("", "DEFAULT_GROUP", "a", "x: 3")
+    assert len(first) == 1 and len(second) == 2
+    assert not await manager.remove_listener("a", callback=on_first)
+
+    assert await manager.remove_listener("a", callback=on_second)
+    assert service.listeners == []
+    assert "a" not in [key[2] for key in manager.config_listeners]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_add_listener_subscribes_once():
+    manager, service = make_manager({"a": "x: 1"})
+    first, second = [], []
+    service.gate = asyncio.Event()
+    tasks = [
+        asyncio.create_task(manager.add_listener(ConfigListener(data_id="a", group="DEFAULT_GROUP", callback=lambda *args: first.append(args)))),
+        asyncio.create_task(manager.add_listener(ConfigListener(data_id="a", group="DEFAULT_GROUP", callback=lambda *args: second.append(args)))),
+    ]
+    await asyncio.sleep(0)
+    service.gate.set()
+    assert await asyncio.gather(*tasks) == [True, True]
+    assert len(service.listeners) == 1
+
+    _, _, sdk_listener = service.listeners[0]
+    await sdk_listener("", "DEFAULT_GROUP", "a", "x: 2")
+    assert len(first) == 1 and len(second) == 1
+
+    await manager.remove_listener("a")
+    assert service.listeners == []
+
+
+@pytest.mark.asyncio
+async def test_concurrent_add_listener_retries_after_failed_subscription():
+    manager, service = make_manager({"a": "x: 1"})
+    service.gate = asyncio.Event()
+    service.subscribe_error = RuntimeError("boom")
+
+    def on_change(*args):
+        pass
+
+    failing = asyncio.create_task(manager.add_listener(ConfigListener(data_id="a", group="DEFAULT_GROUP", callback=print)))
+    await asyncio.sleep(0)
+    waiting = asyncio.create_task(manager.add_listener(ConfigListener(data_id="a", group="DEFAULT_GROUP", callback=on_change)))
+    await asyncio.sleep(0)
+    service.gate.set()
+    with pytest.raises(ConfigListenerError):
+        await failing
+    # 第一次订阅失败后，等待中的调用自行订阅
+    assert await waiting
+    assert len(service.listeners) == 1
+    assert [listener.callback for listener in manager.config_listeners[("", "DEFAULT_GROUP", "a")]] == [on_change]
+    assert manager._subscribing == {}
+
+
+@pytest.mark.asyncio
+async def test_failing_listener_does_not_block_others():
+    manager, service = make_manager({"a": "x: 1"})
+    received = []
+
+    def broken(*args):
+        raise RuntimeError("boom")
+
+    await manager.add_listener(ConfigListener(data_id="a", group="DEFAULT_GROUP", callback=broken))
+    await manager.add_listener(ConfigListener(data_id="a", group="DEFAULT_GROUP", callback=lambda *args: received.append(args)))
+    _, _, sdk_listener = service.listeners[0]
+    await sdk_listener("", "DEFAULT_GROUP", "a", "x: 2")
+    assert len(received) == 1
+    assert await manager.get_config("a") == "x: 2"
@@ -0,0 +1,24 @@
+import pytest
+from fastapi import HTTPException
+
+from my_fastapi_nacos.core.dependencies import get_nacos_client
+from my_fastapi_nacos.core.manager import NacosClientManager
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = NacosClientManager()
+    monkeypatch.setattr(NacosClientManager, "_instance", manager)
+    return manager
+
+
+def test_get_nacos_client_raises_503_before_init(manager):
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc_info:
+            get_nacos_client()
+        assert exc_info.value.status_code == 503
+
+
+def test_get_nacos_client_returns_initialized_client(manager):
+    manager._config = object()
+    assert get_nacos_client() is manager
@@ -0,0 +1,132 @@
+import pytest
+from loguru import logger
+
+from my_fastapi_nacos.core.discovery import ServiceDiscovery
+from my_fastapi_nacos.core.manager import NacosClientManager
+from my_fastapi_nacos.core.registration import ServiceRegistry
+
+
+class FakeNamingService:
+    """模拟Nacos命名服务，记录查询参数，注册和注销时更新实例列表"""
+
+    def __init__(self):
+        self.hosts = {}
+        self.queries = []
+
+    async def list_instances(self, param):
+        self.queries.append((param.service_name, param.group_name, param.healthy_only, tuple(param.clusters)))
+        return [
+            {"ip": ip, "port": port, "clusterName": "DEFAULT", "instanceId": f"{ip}:{port}"}
+            for ip, port in self.hosts.get(param.service_name, [])
+        ]
+
+    async def register_instance(self, param):
+        self.hosts.setdefault(param.service_name, []).append((param.ip, param.port))
+        return True
+
+    async def deregister_instance(self, param):
+        self.hosts[param.service_name].remove((param.ip, param.port))
+        return True
+
+
+class Clock:
+    """可手动推进的单调时钟"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def naming_service():
+    service = FakeNamingService()
+    service.hosts = {"user": [("10.0.0.1", 8000)], "order": [("10.0.0.2", 8001)]}
+    return service
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def discovery(naming_service, clock):
+    discovery = ServiceDiscovery(naming_service, logger, "127.0.0.1:8848")
+    discovery._get_current_timestamp = clock
+    return discovery
+
+
+@pytest.fixture
+def manager(naming_service, discovery):
+    manager = NacosClientManager()
+    manager._registry = ServiceRegistry(naming_service, logger, "127.0.0.1:8848")
+    manager._discovery = discovery
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_within_ttl(discovery, naming_service, clock):
+    first = await discovery.get_service_instances("user")
+    clock.now += discovery.cache_ttl - 0.1
+    second = await discovery.get_service_instances("user")
+    assert [i.ip for i in second] == ["10.0.0.1"]
+    assert len(naming_service.queries) == 1
+    # 返回的是缓存列表的副本，修改不影响缓存
+    first.clear()
+    assert len(await discovery.get_service_instances("user")) == 1
+
+
+@pytest.mark.asyncio
+async def test_refetch_after_ttl_expires(discovery, naming_service, clock):
+    await discovery.get_service_instances("user")
+    naming_service.hosts["user"].append(("10.0.0.3", 8000))
+    clock.now += discovery.cache_ttl
+    instances = await discovery.get_service_instances("user")
+    assert [i.ip for i in instances] == ["10.0.0.1", "10.0.0.3"]
+    assert len(naming_service.queries) == 2
+
+
+@pytest.mark.asyncio
+async def test_query_options_are_cached_separately(discovery, naming_service):
+    await discovery.get_service_instances("user")
+    await discovery.get_service_instances("user", healthy_only=False)
+    await discovery.get_service_instances("user", clusters=["A"])
+    await discovery.get_service_instances("user", clusters=["A", "B"])
+    await discovery.get_service_instances("user", group_name="OTHER")
+    assert len(naming_service.queries) == 5
+    assert len(set(naming_service.queries)) == 5
+    # 相同参数命中各自的缓存
+    await discovery.get_service_instances("user", clusters=["A"])
+    await discovery.get_service_instances("user", healthy_only=False)
+    assert len(naming_service.queries) == 5
+
+
+@pytest.mark.asyncio
+async def test_register_and_deregister_invalidate_cache(manager, naming_service):
+    await manager.get_service_instances("user")
+    await manager.get_service_instances("user", clusters=["A"])
+    await manager.get_service_instances("order")
+
+    await manager.register_service(service_name="user", ip="10.0.0.9", port=9000)
+    assert [i.ip for i in await manager.get_service_instances("user")] == ["10.0.0.1", "10.0.0.9"]
+    assert len(naming_service.queries) == 4
+    # 只清除该服务的缓存，包括其他查询参数的缓存
+    await manager.get_service_instances("user", clusters=["A"])
+    await manager.get_service_instances("order")
+    assert len(naming_service.queries) == 5
+
+    await manager.deregister_service(service_name="user", ip="10.0.0.9", port=9000)
+    assert [i.ip for i in await manager.get_service_instances("user")] == ["10.0.0.1"]
+    assert len(naming_service.queries) == 6
+
+
+@pytest.mark.asyncio
+async def test_get_many_service_instances_dedupes_names(manager, naming_service):
+    result = await manager.get_many_service_instances(["user", "order", "user", "missing"])
+    assert list(result) == ["user", "order", "missing"]
+    assert [i.ip for i in result["user"]] == ["10.0.0.1"]
+    assert [i.ip for i in result["order"]] == ["10.0.0.2"]
+    assert result["missing"] == []
+    assert sorted(query[0] for query in naming_service.queries) == ["missing", "order", "user"]
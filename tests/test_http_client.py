@@ -0,0 +1,98 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from my_fastapi_nacos.http import http_client
+from my_fastapi_nacos.http.http_client import FeignClient, GetMapping
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """返回请求路径的JSON响应，使用HTTP/1.1保持连接"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"path": self.path}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(base_url):
+    @FeignClient(base_url=base_url)
+    class EchoClient:
+        @GetMapping("/items/{id}")
+        async def get_item(self, id: int) -> dict:
+            pass
+
+    return EchoClient()
+
+
+def test_shared_client_works_across_event_loops(server_url):
+    client = make_client(server_url)
+    # 每次asyncio.run都会创建新的事件循环，共享客户端不能复用上一个循环的连接
+    assert asyncio.run(client.get_item(1)) == {"path": "/items/1"}
+    assert asyncio.run(client.get_item(2)) == {"path": "/items/2"}
+    # 已关闭事件循环的客户端被丢弃，不会持续累积
+    assert len([key for key in http_client._clients if key[0] == server_url]) == 1
+
+
+def test_close_feign_clients_closes_current_loop_clients(server_url):
+    client = make_client(server_url)
+
+    async def call_and_close():
+        await client.get_item(1)
+        shared = [c for key, c in http_client._clients.items() if key[0] == server_url]
+        await http_client.close_feign_clients()
+        return shared
+
+    shared = asyncio.run(call_and_close())
+    assert shared and all(c.is_closed for c in shared)
+    assert not [key for key in http_client._clients if key[0] == server_url]
+
+
+def test_batch_rejects_concurrency_below_one(server_url):
+    client = make_client(server_url)
+
+    async def run():
+        with pytest.raises(ValueError):
+            await FeignClient.batch(client.get_item(1), concurrency=0)
+        return await FeignClient.batch(client.get_item(1), client.get_item(2), concurrency=1)
+
+    assert asyncio.run(run()) == [{"path": "/items/1"}, {"path": "/items/2"}]
+
+
+def test_http2_is_opt_in_per_client(server_url):
+    pytest.importorskip("h2")
+
+    @FeignClient(base_url=server_url, http2=True)
+    class Http2Client:
+        @GetMapping("/items/{id}")
+        async def get_item(self, id: int) -> dict:
+            pass
+
+    async def run():
+        # http地址无法协商HTTP/2，仍按HTTP/1.1正常请求
+        assert await Http2Client().get_item(1) == {"path": "/items/1"}
+        assert await make_client(server_url).get_item(2) == {"path": "/items/2"}
+        return sorted(key[2] for key in http_client._clients if key[0] == server_url)
+
+    assert asyncio.run(run()) == [False, True]
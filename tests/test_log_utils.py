@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT = """
+import os
+from loguru import logger
+import my_fastapi_nacos
+from my_fastapi_nacos.utils import log_utils
+
+# 导入时不修改日志输出，也不创建日志目录
+assert list(logger._core.handlers) == [0], list(logger._core.handlers)
+assert log_utils.log is logger
+assert not os.path.exists("logs")
+
+# 配置日志时只移除loguru默认输出，保留用户添加的输出
+user_sink = logger.add(lambda message: None)
+my_fastapi_nacos.configure_logging()
+my_fastapi_nacos.configure_logging()
+handlers = list(logger._core.handlers)
+assert 0 not in handlers and user_sink in handlers and len(handlers) == 3, handlers
+assert os.path.isdir("logs")
+"""
+
+
+def test_import_does_not_configure_logging(tmp_path):
+    env = dict(os.environ, PYTHONPATH=PACKAGE_ROOT)
+    env.pop("FASTAPI_NACOS_CONFIG_FILE", None)
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,19 @@
+import dataclasses
+
+import pytest
+
+from my_fastapi_nacos.models.config import ConfigListener
+
+
+def test_config_listener_is_frozen_dataclass():
+    listener = ConfigListener(data_id="a", group="DEFAULT_GROUP", callback=print)
+    assert dataclasses.asdict(listener) == {"data_id": "a", "group": "DEFAULT_GROUP", "callback": print}
+    assert listener == ConfigListener(data_id="a", group="DEFAULT_GROUP", callback=print)
+    assert not hasattr(listener, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        listener.group = "other"
+
+
+def test_config_listener_rejects_unknown_arguments():
+    with pytest.raises(TypeError):
+        ConfigListener(data_id="a", group="DEFAULT_GROUP", calback=print)